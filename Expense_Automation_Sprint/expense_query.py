@@ -0,0 +1,268 @@
+"""
+Expense Query Engine
+
+A single-pass hash-aggregation engine for expense CSV files.
+Groups rows by any combination of columns and computes aggregates
+over any numeric column.
+
+Features:
+- Arbitrary group-by keys (Category, Vendor, Cost Center, ...)
+- sum, count, mean, min, max, median and pN percentile aggregates
+- Single-pass hash aggregation keyed on C-built key tuples
+- Text and CSV result output
+
+Author: Xeyronox
+Version: 0.1
+License: MIT
+"""
+
+import csv
+import io
+import operator
+import os
+
+# Aggregates that need every value kept (the rest use running state)
+PERCENTILE_ALIASES = {'median': 50.0}
+SIMPLE_AGGREGATES = ('sum', 'count', 'mean', 'min', 'max')
+
+
+def parse_aggregate(spec):
+    """
+    Parse an aggregate spec such as 'sum:Amount', 'p95:Amount' or 'count'.
+
+    Returns: (name, column, percentile) where percentile is None for
+    non-percentile aggregates and column is None for a plain row count.
+    Raises ValueError for unknown aggregates or missing columns.
+    """
+    name, _, column = spec.strip().partition(':')
+    name = name.strip().lower()
+    column = column.strip() or None
+
+    percentile = None
+    if name in PERCENTILE_ALIASES:
+        percentile = PERCENTILE_ALIASES[name]
+    elif name.startswith('p') and name[1:].replace('.', '', 1).isdigit():
+        percentile = float(name[1:])
+        if not 0 <= percentile <= 100:
+            raise ValueError(f"Invalid percentile: {name}. Must be between p0 and p100")
+    elif name not in SIMPLE_AGGREGATES:
+        raise ValueError(f"Unknown aggregate: {name}")
+
+    if column is None and name != 'count':
+        raise ValueError(f"Aggregate '{name}' needs a column, e.g. {name}:Amount")
+    return name, column, percentile
+
+
+def percentile_of(values, percentile):
+    """Linear-interpolated percentile of a list of numbers (sorts in place)."""
+    if not values:
+        return None
+    values.sort()
+    position = (len(values) - 1) * percentile / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def group_by(csv_file, keys, aggregates):
+    """
+    Group a CSV file by one or more columns in a single pass.
+
+    Group keys are built with operator.itemgetter, which creates the key
+    tuple in C without a per-column Python loop. Key values are stripped
+    once per group after the pass rather than once per row; raw groups that
+    only differ by surrounding whitespace are merged then. Blank lines are
+    skipped silently. Rows may omit trailing columns the query does not
+    read; rows missing a needed column or with a non-numeric value in an
+    aggregated column are skipped with a warning.
+
+    Args:
+        csv_file: Path to the CSV file
+        keys: List of column names to group by (may be empty)
+        aggregates: List of aggregate specs, e.g. ['sum:Amount', 'count']
+
+    Returns: list of result dicts, one per group, with the key columns
+    followed by one entry per aggregate spec (in first-seen group order)
+    Raises ValueError if a requested column is not in the CSV header.
+    """
+    parsed = [parse_aggregate(spec) for spec in aggregates]
+    labels = [spec.strip() for spec in aggregates]
+
+    with open(csv_file, 'r', newline='') as file:
+        reader = csv.reader(file)
+        header = [name.strip() for name in next(reader, [])]
+        index = {name: i for i, name in enumerate(header)}
+
+        missing = [name for name in list(keys) + [col for _, col, _ in parsed if col]
+                   if name not in index]
+        if missing:
+            raise ValueError(f"Unknown column(s): {', '.join(missing)}")
+
+        # Each distinct value column is parsed once per row, however many
+        # aggregates read it
+        value_columns = []
+        for _, column, _ in parsed:
+            if column and column not in value_columns:
+                value_columns.append(column)
+        value_indexes = [index[column] for column in value_columns]
+        slot_of = {column: slot for slot, column in enumerate(value_columns)}
+
+        key_indexes = [index[name] for name in keys]
+        if len(keys) > 1:
+            key_of = operator.itemgetter(*key_indexes)
+        elif keys:
+            single = operator.itemgetter(key_indexes[0])
+            key_of = lambda row: (single(row),)
+        else:
+            key_of = lambda row: ()
+
+        # Group table: raw key tuple -> group number, plus per-group state
+        groups = {}
+        row_counts = []
+        sums = [[] for _ in value_columns]
+        counts = [[] for _ in value_columns]
+        minimums = [[] for _ in value_columns]
+        maximums = [[] for _ in value_columns]
+        needs_values = {slot_of[col] for _, col, pct in parsed if pct is not None}
+        samples = [[] if slot in needs_values else None for slot in range(len(value_columns))]
+
+        value_slots = range(len(value_columns))
+        # Rows only need the columns this query reads; trailing optional
+        # columns may be missing
+        width = max(key_indexes + value_indexes, default=-1) + 1
+
+        for row_num, row in enumerate(reader, start=2):
+            if not row:
+                continue  # Blank line
+            if len(row) < width:
+                print(f"Warning: Row {row_num} invalid - missing columns. Skipping.")
+                continue
+            try:
+                values = [float(row[i]) for i in value_indexes]
+            except ValueError as e:
+                print(f"Warning: Row {row_num} invalid - {e}. Skipping.")
+                continue
+
+            key = key_of(row)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = len(row_counts)
+                row_counts.append(0)
+                for slot in value_slots:
+                    sums[slot].append(0.0)
+                    counts[slot].append(0)
+                    minimums[slot].append(values[slot])
+                    maximums[slot].append(values[slot])
+                    if samples[slot] is not None:
+                        samples[slot].append([])
+
+            row_counts[group] += 1
+            for slot in value_slots:
+                value = values[slot]
+                sums[slot][group] += value
+                counts[slot][group] += 1
+                if value < minimums[slot][group]:
+                    minimums[slot][group] = value
+                if value > maximums[slot][group]:
+                    maximums[slot][group] = value
+                if samples[slot] is not None:
+                    samples[slot][group].append(value)
+
+    # Strip key values and merge raw groups that only differ by whitespace
+    merged = {}
+    for key, group in groups.items():
+        merged.setdefault(tuple(value.strip() for value in key), []).append(group)
+
+    results = []
+    for key, members in merged.items():
+        result = dict(zip(keys, key))
+        for label, (name, column, percentile) in zip(labels, parsed):
+            if column is None:
+                result[label] = sum(row_counts[g] for g in members)
+                continue
+            slot = slot_of[column]
+            if percentile is not None:
+                values = [value for g in members for value in samples[slot][g]]
+                result[label] = percentile_of(values, percentile)
+            elif name == 'sum':
+                result[label] = sum(sums[slot][g] for g in members)
+            elif name == 'count':
+                result[label] = sum(counts[slot][g] for g in members)
+            elif name == 'mean':
+                result[label] = (sum(sums[slot][g] for g in members)
+                                 / sum(counts[slot][g] for g in members))
+            elif name == 'min':
+                result[label] = min(minimums[slot][g] for g in members)
+            else:
+                result[label] = max(maximums[slot][g] for g in members)
+        results.append(result)
+
+    return results
+
+
+def _format_value(value):
+    """Format an aggregate value for output."""
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def render_table(results):
+    """Render group-by results as an aligned text table."""
+    if not results:
+        return "No matching expenses found.\n"
+    columns = list(results[0])
+    rows = [[_format_value(result[col]) for col in columns] for result in results]
+    widths = [max(len(col), *(len(row[i]) for row in rows)) for i, col in enumerate(columns)]
+    lines = ["  ".join(col.ljust(w) for col, w in zip(columns, widths)).rstrip(),
+             "  ".join("-" * w for w in widths)]
+    lines.extend("  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip() for row in rows)
+    return "\n".join(lines) + "\n"
+
+
+def render_csv(results):
+    """Render group-by results as CSV."""
+    buffer = io.StringIO()
+    if results:
+        writer = csv.writer(buffer, lineterminator='\n')
+        columns = list(results[0])
+        writer.writerow(columns)
+        writer.writerows([_format_value(result[col]) for col in columns] for result in results)
+    return buffer.getvalue()
+
+
+def main():
+    """Interactive group-by query over an expense CSV file."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(script_dir)
+
+    input_file = input("Enter input CSV file name (default: purchases.csv): ").strip() or 'purchases.csv'
+    keys_str = input("Group by columns (comma-separated, default: Category): ").strip() or 'Category'
+    keys = [key.strip() for key in keys_str.split(',') if key.strip()]
+    aggregates_str = input("Aggregates (comma-separated, default: sum:Amount,count): ").strip() or 'sum:Amount,count'
+    aggregates = [spec.strip() for spec in aggregates_str.split(',') if spec.strip()]
+    output_file = input("Enter output file name (blank to print): ").strip()
+
+    try:
+        results = group_by(input_file, keys, aggregates)
+    except FileNotFoundError:
+        print(f"Error: Input file '{input_file}' not found. Please check the file path.")
+        return
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    if not output_file:
+        print(render_table(results), end='')
+        return
+
+    renderer = render_csv if output_file.lower().endswith('.csv') else render_table
+    try:
+        with open(output_file, 'w') as f:
+            f.write(renderer(results))
+        print(f"Success: Query results written to {output_file}.")
+    except Exception as e:
+        print(f"Error writing results: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,9 @@ Features:
 - Date range filtering
 - Monthly trend analysis
 - Error handling and data integrity checks
+- Text, CSV, JSON and HTML report formats
+- Batch report generation from a single loaded dataset
+- Optional duplicate and outlier detection during loading
 
 Author: Xeyronox
 Version: 0.1
@@ -18,8 +21,349 @@ License: MIT
 
 import csv
 from datetime import datetime
+import functools
+import html
+import io
+import itertools
+import json
 import os
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from ingestion_checks import IngestionChecker
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date(text):
+    """Parse a YYYY-MM-DD date; cached because exports repeat the same dates."""
+    return datetime.strptime(text, '%Y-%m-%d').date()
+
+
+@functools.lru_cache(maxsize=4096)
+def _month_key(row_date):
+    """YYYY-MM key for monthly trends; cached like _parse_date."""
+    return row_date.strftime('%Y-%m')
+
+
+def iter_expenses(input_file, checker=None, columns=()):
+    """
+    Stream validated expense records from a CSV file.
+
+    Each valid row is yielded as a (row_date, category, amount, extras)
+    tuple, where row_date is None when the Date column is missing or
+    malformed and extras holds the stripped values of the requested extra
+    columns (Vendor, Cost Center, ...), in the order given.
+    Rows with an unreadable category or amount are skipped with a warning.
+    When an IngestionChecker is given, rows identical to a recent row are
+    skipped; possible duplicates and outliers are reported as warnings.
+
+    Rows are read one at a time, so memory use does not grow with file size.
+    File-level errors (missing file, permissions) are left to the caller.
+    Raises ValueError if a requested extra column is not in the CSV header.
+    """
+    with open(input_file, 'r', newline='') as file:  # Specify newline='' for cross-platform compatibility
+        reader = csv.DictReader(file)
+        missing = [column for column in columns if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Unknown column(s): {', '.join(missing)}")
+
+        for row_num, row in enumerate(reader, start=2):
+            try:
+                # Extract and validate data from CSV row
+                category = row['Category'].strip()
+                amount = float(row['Amount'])
+
+                # Parse date for trend analysis (optional field)
+                row_date = None
+                try:
+                    row_date = _parse_date(row['Date'].strip())
+                except ValueError:
+                    # Date parsing is optional - continue without monthly breakdown
+                    pass
+
+                if checker:
+                    is_duplicate, issues = checker.check(row.values(), row_date, category, amount)
+                    if is_duplicate:
+                        print(f"Warning: Row {row_num} is a duplicate. Skipping.")
+                        continue
+                    for issue in issues:
+                        print(f"Warning: Row {row_num} flagged - {issue}.")
+
+                if columns:
+                    yield row_date, category, amount, tuple((row[column] or '').strip()
+                                                            for column in columns)
+                else:
+                    yield row_date, category, amount, ()
+
+            except (ValueError, KeyError) as e:
+                # Handle data validation errors gracefully
+                print(f"Warning: Skipping invalid row - {e}")
+                continue
+
+
+def load_expenses(input_file, checker=None, columns=()):
+    """
+    Load every expense record from a CSV file into a list.
+
+    Only needed when the same dataset is reused, as in generate_reports;
+    single reports should stream iter_expenses instead.
+    Returns: list of (row_date, category, amount, extras) tuples
+    """
+    return list(iter_expenses(input_file, checker, columns))
+
+
+def summarize_expenses(records, filter_categories=None, start_date=None, end_date=None,
+                       monthly_totals=None):
+    """
+    Build the report model for one set of filters.
+
+    Monthly trends always cover the full dataset so filtered reports can be
+    compared against overall spending; category totals and transaction
+    counts honour the category and date filters. Callers that summarize a
+    slice of the dataset pass the full-dataset monthly_totals in.
+
+    records may be any iterable of (row_date, category, amount, extras)
+    tuples, including the iter_expenses generator.
+
+    Returns: dict with category_totals, monthly_totals, total_spending
+    and total_entries
+    """
+    category_totals = defaultdict(float)  # Automatically handles new categories
+    total_entries = 0
+    filter_set = set(filter_categories) if filter_categories else None
+    track_months = monthly_totals is None
+    if track_months:
+        monthly_totals = defaultdict(float)   # Track spending by month
+
+    for row_date, category, amount, _ in records:
+        if track_months and row_date:
+            monthly_totals[_month_key(row_date)] += amount
+
+        # Apply user-defined filters
+        if filter_set and category not in filter_set:
+            continue  # Skip categories not in the filter list
+
+        # Apply date range filters if specified
+        if start_date and row_date and row_date < start_date:
+            continue  # Skip entries before start date
+        if end_date and row_date and row_date > end_date:
+            continue  # Skip entries after end date
+
+        # Accumulate valid data
+        category_totals[category] += amount
+        total_entries += 1
+
+    return {
+        'category_totals': dict(category_totals),
+        'monthly_totals': dict(sorted(monthly_totals.items())),
+        'total_spending': sum(category_totals.values()),
+        'total_entries': total_entries
+    }
+
+
+def render_text(summary):
+    """Render a summary in the plain-text Monthly_Summary.txt layout."""
+    category_totals = summary['category_totals']
+    total_spending = summary['total_spending']
+    total_entries = summary['total_entries']
+
+    lines = ["Monthly Expense Summary", ""]
+    if category_totals:
+        for category, total in category_totals.items():
+            lines.append(f"{category}: ${total:.2f}")
+        lines += ["", "", "Advanced Analytics:"]
+        lines.append(f"Total Spending: ${total_spending:.2f}")
+        lines.append(f"Number of Transactions: {total_entries}")
+        if total_entries > 0:
+            lines.append(f"Average Transaction: ${total_spending / total_entries:.2f}")
+        lines.append("Monthly Trends:")
+        for month, total in summary['monthly_totals'].items():
+            lines.append(f"  {month}: ${total:.2f}")
+        lines.append(f"Predicted Next Month: ${total_spending * 1.05:.2f} (5% increase)")
+    else:
+        lines.append("No matching expenses found.")
+    return "\n".join(lines) + "\n"
+
+
+def render_csv(summary):
+    """Render a summary as Section,Key,Value CSV rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(['Section', 'Key', 'Value'])
+    writer.writerows(('Category', category, f"{total:.2f}")
+                     for category, total in summary['category_totals'].items())
+    writer.writerow(['Total', 'Spending', f"{summary['total_spending']:.2f}"])
+    writer.writerow(['Total', 'Transactions', summary['total_entries']])
+    writer.writerows(('Month', month, f"{total:.2f}")
+                     for month, total in summary['monthly_totals'].items())
+    return buffer.getvalue()
+
+
+def render_json(summary):
+    """Render a summary as a JSON document."""
+    total_entries = summary['total_entries']
+    document = dict(summary)
+    document['average_transaction'] = (summary['total_spending'] / total_entries
+                                       if total_entries else 0.0)
+    document['predicted_next_month'] = summary['total_spending'] * 1.05
+    return json.dumps(document, indent=2) + "\n"
+
+
+def render_html(summary):
+    """Render a summary as a standalone HTML page."""
+    category_totals = summary['category_totals']
+    total_spending = summary['total_spending']
+    total_entries = summary['total_entries']
+
+    parts = ["<!DOCTYPE html>",
+             "<html>",
+             "<head><meta charset=\"utf-8\"><title>Monthly Expense Summary</title></head>",
+             "<body>",
+             "<h1>Monthly Expense Summary</h1>"]
+    if category_totals:
+        parts.append("<table>")
+        parts.append("<tr><th>Category</th><th>Total</th></tr>")
+        parts.extend(f"<tr><td>{html.escape(category)}</td><td>${total:.2f}</td></tr>"
+                     for category, total in category_totals.items())
+        parts.append("</table>")
+        parts.append("<h2>Advanced Analytics</h2>")
+        parts.append("<ul>")
+        parts.append(f"<li>Total Spending: ${total_spending:.2f}</li>")
+        parts.append(f"<li>Number of Transactions: {total_entries}</li>")
+        if total_entries > 0:
+            parts.append(f"<li>Average Transaction: ${total_spending / total_entries:.2f}</li>")
+        parts.append(f"<li>Predicted Next Month: ${total_spending * 1.05:.2f} (5% increase)</li>")
+        parts.append("</ul>")
+        parts.append("<h2>Monthly Trends</h2>")
+        parts.append("<table>")
+        parts.append("<tr><th>Month</th><th>Total</th></tr>")
+        parts.extend(f"<tr><td>{month}</td><td>${total:.2f}</td></tr>"
+                     for month, total in summary['monthly_totals'].items())
+        parts.append("</table>")
+    else:
+        parts.append("<p>No matching expenses found.</p>")
+    parts += ["</body>", "</html>"]
+    return "\n".join(parts) + "\n"
+
+
+# Report formats - register new renderers here
+RENDERERS = {
+    'text': render_text,
+    'csv': render_csv,
+    'json': render_json,
+    'html': render_html
+}
+
+# Output file extensions that select a non-text renderer
+FORMAT_EXTENSIONS = {
+    '.csv': 'csv',
+    '.json': 'json',
+    '.html': 'html',
+    '.htm': 'html'
+}
+
+
+def detect_format(output_file):
+    """Pick a report format from the output file extension (default: text)."""
+    extension = os.path.splitext(output_file)[1].lower()
+    return FORMAT_EXTENSIONS.get(extension, 'text')
+
+
+def write_report(summary, output_file, fmt=None):
+    """
+    Render a summary and write it to disk.
+
+    The whole document is built in memory first and written with a single
+    call, so generating many reports does not pay per-line I/O costs.
+    """
+    renderer = RENDERERS[fmt or detect_format(output_file)]
+    document = renderer(summary)
+    with open(output_file, 'w') as f:
+        f.write(document)
+    return output_file
+
+
+# Dataset shared with report worker processes (set once per worker)
+_shared = {}
+
+
+def _init_report_worker(records, columns):
+    """Store the loaded dataset in a worker process."""
+    _shared['records'] = records
+    _shared['positions'] = {column: i for i, column in enumerate(columns)}
+    _shared['partitions'] = {}
+    _shared['monthly_totals'] = None
+
+
+def _job_records(column_filters):
+    """
+    Return the slice of the shared dataset a job's column filters select.
+
+    The dataset is partitioned once per worker for each combination of
+    filter columns, so a batch of per-cost-center jobs costs one pass over
+    the data plus each job's own rows, not one full pass per job.
+    """
+    records = _shared['records']
+    if not column_filters:
+        return records
+
+    names = tuple(sorted(column_filters))
+    partition = _shared['partitions'].get(names)
+    if partition is None:
+        positions = [_shared['positions'][name] for name in names]
+        partition = defaultdict(list)
+        for record in records:
+            extras = record[3]
+            partition[tuple(extras[position] for position in positions)].append(record)
+        _shared['partitions'][names] = partition
+
+    accepted = [[values] if isinstance(values, str) else list(values)
+                for values in (column_filters[name] for name in names)]
+    selected = []
+    for key in itertools.product(*accepted):
+        selected.extend(partition.get(key, ()))
+    return selected
+
+
+def _run_report_job(job):
+    """Summarize and write one report inside a worker process."""
+    if _shared['monthly_totals'] is None:
+        _shared['monthly_totals'] = summarize_expenses(_shared['records'])['monthly_totals']
+    summary = summarize_expenses(_job_records(job.get('column_filters')),
+                                 job.get('filter_categories'),
+                                 job.get('start_date'),
+                                 job.get('end_date'),
+                                 _shared['monthly_totals'])
+    return write_report(summary, job['output_file'], job.get('format'))
+
+
+def generate_reports(input_file, jobs, max_workers=None, checker=None):
+    """
+    Generate many reports in parallel from one loaded dataset.
+
+    Each job is a dict with an 'output_file' key and optional
+    'filter_categories', 'start_date', 'end_date', 'column_filters' and
+    'format' keys. column_filters maps a CSV column name to the value (or
+    list of values) a row must have, e.g. {'Cost Center': 'CC-12'}.
+
+    The CSV is loaded once, keeping only the columns the jobs filter on,
+    and sent to each worker process once. Jobs are handed out in chunks to
+    keep inter-process round-trips low when there are thousands of reports.
+
+    Returns: list of written output file names, in job order
+    Raises ValueError if a column filter names a column not in the CSV.
+    """
+    if not jobs:
+        return []
+    columns = sorted({column for job in jobs for column in (job.get('column_filters') or {})})
+    records = load_expenses(input_file, checker, columns)
+
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers,
+                             initializer=_init_report_worker,
+                             initargs=(records, columns)) as executor:
+        return list(executor.map(_run_report_job, jobs, chunksize=chunksize))
 
 
 def main():
@@ -60,51 +404,15 @@ def main():
             # Handle invalid date formats gracefully
             print("Invalid date format. Proceeding without date filter.")
 
-    # Process the CSV file with comprehensive error handling
-    try:
-        with open(input_file, 'r', newline='') as file:  # Specify newline='' for cross-platform compatibility
-            reader = csv.DictReader(file)
-
-            # Initialize data structures for analysis
-            category_totals = defaultdict(float)  # Automatically handles new categories
-            monthly_totals = defaultdict(float)   # Track spending by month
-            total_entries = 0
-
-            for row in reader:
-                try:
-                    # Extract and validate data from CSV row
-                    category = row['Category'].strip()
-                    amount = float(row['Amount'])
-
-                    # Parse date for trend analysis (optional field)
-                    row_date = None
-                    try:
-                        row_date = datetime.strptime(row['Date'].strip(), '%Y-%m-%d').date()
-                        month_key = row_date.strftime('%Y-%m')
-                        monthly_totals[month_key] += amount
-                    except ValueError:
-                        # Date parsing is optional - continue without monthly breakdown
-                        pass
-
-                    # Apply user-defined filters
-                    if filter_categories and category not in filter_categories:
-                        continue  # Skip categories not in the filter list
-
-                    # Apply date range filters if specified
-                    if start_date and row_date and row_date < start_date:
-                        continue  # Skip entries before start date
-                    if end_date and row_date and row_date > end_date:
-                        continue  # Skip entries after end date
-
-                    # Accumulate valid data
-                    category_totals[category] += amount
-                    total_entries += 1
-
-                except (ValueError, KeyError) as e:
-                    # Handle data validation errors gracefully
-                    print(f"Warning: Skipping invalid row - {e}")
-                    continue
+    # Optional duplicate and outlier detection while loading
+    checker = None
+    if input("Check for duplicates and outliers? (y/n): ").strip().lower() == 'y':
+        checker = IngestionChecker()
 
+    # Stream the CSV file through the summary with comprehensive error handling
+    try:
+        summary = summarize_expenses(iter_expenses(input_file, checker),
+                                     filter_categories, start_date, end_date)
     except FileNotFoundError:
         print(f"Error: Input file '{input_file}' not found. Please check the file path.")
         return
@@ -115,28 +423,14 @@ def main():
         print(f"Error reading file: {e}")
         return
 
-    total_spending = sum(category_totals.values())
+    if checker:
+        print(checker.summary())
 
     try:
-        with open(output_file, 'w') as f:
-            f.write("Monthly Expense Summary\n\n")
-            if category_totals:
-                for category, total in category_totals.items():
-                    f.write(f"{category}: ${total:.2f}\n")
-                f.write("\n\nAdvanced Analytics:\n")
-                f.write(f"Total Spending: ${total_spending:.2f}\n")
-                f.write(f"Number of Transactions: {total_entries}\n")
-                if total_entries > 0:
-                    f.write(f"Average Transaction: ${total_spending / total_entries:.2f}\n")
-                f.write("Monthly Trends:\n")
-                for month, total in sorted(monthly_totals.items()):
-                    f.write(f"  {month}: ${total:.2f}\n")
-                f.write(f"Predicted Next Month: ${total_spending * 1.05:.2f} (5% increase)\n")
-            else:
-                f.write("No matching expenses found.\n")
+        write_report(summary, output_file)
         print(f"Success: Summary generated in {output_file}.")
     except Exception as e:
         print(f"Error writing summary: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,178 @@
+"""
+Ingestion Checks
+
+Streaming duplicate and outlier detection for CSV loaders.
+Used by expense_summary.py and by the Finance Utility's
+profit_loss_calculator.py.
+
+Features:
+- Exact duplicate rows skipped after an exact full-row check
+- Older repeats and near duplicates flagged, never dropped
+- Per-label outliers from running mean and variance (Welford)
+- Memory bounded regardless of file size
+
+Author: Xeyronox
+Version: 0.1
+License: MIT
+"""
+
+import hashlib
+import math
+from collections import OrderedDict, defaultdict, deque
+
+
+def row_digest(fields):
+    """Hash the raw fields of a CSV row into a compact 16-byte digest."""
+    raw = "\x1f".join('' if field is None else str(field) for field in fields)
+    return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+
+class BloomFilter:
+    """
+    Fixed-size probabilistic set for membership checks.
+
+    Never misses an added key, but can report a key it has not seen:
+    roughly error_rate of the time while fewer than capacity keys have been
+    added, and quickly more often after that.
+    """
+
+    def __init__(self, capacity=1000000, error_rate=0.0001):
+        self.capacity = capacity
+        self.count = 0
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, digest):
+        """Add a row digest; returns True if it was (probably) already present."""
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        present = True
+        for i in range(self.hash_count):
+            byte, bit = divmod((first + i * second) % self.size, 8)
+            if not self.bits[byte] & (1 << bit):
+                present = False
+                self.bits[byte] |= 1 << bit
+        if not present:
+            self.count += 1
+        return present
+
+
+class IngestionChecker:
+    """
+    Streaming duplicate and outlier checks for rows as they are loaded.
+
+    - Exact duplicates: a row whose raw CSV fields are identical to one of
+      the last max_recent rows is confirmed by an exact digest lookup and
+      should be skipped by the caller
+    - Earlier repeats: rows the Bloom filter has (probably) seen before,
+      outside that window, are only flagged since the filter can be wrong
+    - Near duplicates: same label, amount within amount_tolerance and date
+      within near_days of a recent row are flagged
+    - Outliers: amounts more than z_threshold standard deviations from the
+      label's running mean (Welford's online algorithm) are flagged
+
+    Memory is bounded by capacity, max_recent and the number of labels,
+    not by file size.
+    """
+
+    def __init__(self, capacity=1000000, error_rate=0.0001, max_recent=100000,
+                 near_days=1, amount_tolerance=0.01, z_threshold=3.0, min_samples=5):
+        if min_samples < 2:
+            raise ValueError(f"Invalid min_samples: {min_samples}. Must be at least 2")
+        self.seen = BloomFilter(capacity, error_rate)
+        self.max_recent = max_recent
+        self.near_days = near_days
+        self.amount_window = round(amount_tolerance * 100)
+        self.z_threshold = z_threshold
+        self.min_samples = min_samples
+
+        # Digests of the most recent rows, for exact duplicate checks
+        self.recent_rows = OrderedDict()
+        # Recent rows for near duplicates: (label, cents bucket) -> (ordinal, cents)
+        self.recent = defaultdict(deque)
+        self.recent_order = deque()
+        # Per-label running statistics: label -> [count, mean, M2]
+        self.stats = defaultdict(lambda: [0, 0.0, 0.0])
+        self.over_capacity = False
+
+        self.duplicates = 0
+        self.possible_duplicates = 0
+        self.near_duplicates = 0
+        self.outliers = 0
+
+    def check(self, fields, row_date, label, amount):
+        """
+        Check one row and update the running state.
+
+        Args:
+            fields: The raw CSV fields of the row
+            row_date: Parsed date, or None if the row has no valid date
+            label: Category (or type and description) used for grouping
+            amount: Parsed amount
+
+        Returns: (is_duplicate, issues) where issues is a list of warning
+        messages for rows that are kept
+        """
+        digest = row_digest(fields)
+        if digest in self.recent_rows:
+            self.recent_rows.move_to_end(digest)
+            self.duplicates += 1
+            return True, []
+
+        issues = []
+        self.recent_rows[digest] = None
+        if len(self.recent_rows) > self.max_recent:
+            self.recent_rows.popitem(last=False)
+
+        if self.seen.add(digest):
+            self.possible_duplicates += 1
+            issues.append('possible repeat of an earlier row')
+        elif self.seen.count > self.seen.capacity and not self.over_capacity:
+            self.over_capacity = True
+            print(f"Warning: More than {self.seen.capacity} distinct rows checked. "
+                  "Repeat flags for older rows are now less reliable.")
+
+        cents = round(amount * 100)
+        if row_date and self._near_duplicate(label, row_date.toordinal(), cents):
+            self.near_duplicates += 1
+            issues.append('possible duplicate of a recent row')
+
+        # Welford update, checking against the statistics before this row
+        stats = self.stats[label]
+        count, mean, m2 = stats
+        if count >= self.min_samples:
+            std = math.sqrt(m2 / (count - 1))
+            if std > 0 and abs(amount - mean) > self.z_threshold * std:
+                self.outliers += 1
+                issues.append(f"outlier for {label} (mean ${mean:.2f}, std ${std:.2f})")
+        count += 1
+        delta = amount - mean
+        mean += delta / count
+        stats[0], stats[1], stats[2] = count, mean, m2 + delta * (amount - mean)
+        return False, issues
+
+    def _near_duplicate(self, label, ordinal, cents):
+        """Look for and then remember a row in the bounded recent window."""
+        bucket = cents // (self.amount_window + 1)
+        found = any(abs(other_ordinal - ordinal) <= self.near_days
+                    and abs(other_cents - cents) <= self.amount_window
+                    for neighbour in (bucket - 1, bucket, bucket + 1)
+                    for other_ordinal, other_cents in self.recent.get((label, neighbour), ()))
+
+        key = (label, bucket)
+        self.recent[key].append((ordinal, cents))
+        self.recent_order.append(key)
+        if len(self.recent_order) > self.max_recent:
+            oldest = self.recent_order.popleft()
+            entries = self.recent[oldest]
+            entries.popleft()
+            if not entries:
+                del self.recent[oldest]
+        return found
+
+    def summary(self):
+        """One-line summary of the issues found so far."""
+        return (f"Ingestion checks: {self.duplicates} duplicate(s) skipped, "
+                f"{self.possible_duplicates + self.near_duplicates} possible duplicate(s), "
+                f"{self.outliers} outlier(s) flagged.")
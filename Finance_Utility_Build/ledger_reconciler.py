@@ -0,0 +1,300 @@
+"""
+Ledger Reconciler
+
+Matches entries from an expense ledger (Date, Category, Amount) against
+the expense side of a profit/loss ledger (Date, Type, Amount, Description).
+
+Features:
+- Hash join on date, amount and category/description
+- Amount and date tolerance windows for fuzzy matching
+- Matched, unmatched and duplicate entry reporting
+- Text and CSV report output
+
+Version: 1.0
+Author: Xeyronox
+"""
+
+import csv
+import io
+import os
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from profit_loss_calculator import validate_row
+
+
+def _parse_date(value):
+    """Parse a YYYY-MM-DD date, returning None when it is malformed."""
+    try:
+        return datetime.strptime(value.strip(), '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def load_expense_ledger(csv_file):
+    """
+    Load an expense ledger with Date, Category and Amount columns.
+
+    Returns: list of entry dicts (row, date, amount, label)
+    """
+    entries = []
+    with open(csv_file, 'r', newline='') as file:
+        reader = csv.DictReader(file)
+        for row_num, row in enumerate(reader, start=2):
+            try:
+                label = row['Category'].strip()
+                amount = float(row['Amount'])
+            except (ValueError, KeyError, AttributeError, TypeError) as e:
+                print(f"Warning: Row {row_num} invalid - {e}. Skipping.")
+                continue
+            row_date = _parse_date(row.get('Date') or '')
+            if row_date is None:
+                print(f"Warning: Row {row_num} invalid - Invalid date. Skipping.")
+                continue
+            entries.append({'row': row_num, 'date': row_date, 'amount': amount, 'label': label})
+    return entries
+
+
+def load_pl_ledger(csv_file):
+    """
+    Load the expense entries of a profit/loss ledger.
+
+    Rows are checked with validate_row; revenue rows are ignored since
+    they have no counterpart in the expense ledger.
+
+    Returns: list of entry dicts (row, date, amount, label)
+    """
+    entries = []
+    with open(csv_file, 'r', newline='') as file:
+        reader = csv.DictReader(file)
+        for row_num, row in enumerate(reader, start=2):
+            valid, result = validate_row(row)
+            if not valid:
+                print(f"Warning: Row {row_num} invalid - {result}. Skipping.")
+                continue
+            if result['type'] != 'expense':
+                continue
+            row_date = _parse_date(result['date'])
+            if row_date is None:
+                print(f"Warning: Row {row_num} invalid - Invalid date. Skipping.")
+                continue
+            entries.append({'row': row_num, 'date': row_date,
+                            'amount': result['amount'], 'label': result['description']})
+    return entries
+
+
+def find_duplicates(entries):
+    """
+    Find entries that share the same date, amount and label.
+
+    Returns: list of lists of duplicate entries (each with 2+ entries)
+    """
+    keys = [(e['date'], round(e['amount'] * 100), e['label'].lower()) for e in entries]
+    counts = Counter(keys)
+    groups = defaultdict(list)
+    for key, entry in zip(keys, entries):
+        if counts[key] > 1:
+            groups[key].append(entry)
+    return list(groups.values())
+
+
+def reconcile(expense_entries, pl_entries, amount_tolerance=0.0, date_tolerance=0,
+              match_labels=True):
+    """
+    Match expense ledger entries against profit/loss ledger entries.
+
+    Matching runs in two passes so a fuzzy match can never take an entry
+    that another expense matches exactly:
+    1. Exact pass: hash join on (label, amount, date)
+    2. Tolerance pass: the remaining profit/loss entries are hashed into
+       buckets by label, amount window and date window; each remaining
+       expense probes its own and neighbouring buckets and takes the
+       closest candidate (by amount, then date)
+    Matched candidates are removed as they are used, so both passes run in
+    near-linear time. Each entry is matched at most once.
+
+    Args:
+        expense_entries: Entries from load_expense_ledger
+        pl_entries: Entries from load_pl_ledger
+        amount_tolerance: Maximum absolute amount difference for a match
+        date_tolerance: Maximum difference in days for a match
+        match_labels: Require category and description to agree (case-insensitive)
+
+    Returns: dict with matched pairs, unmatched entries on each side and
+    duplicate groups on each side
+    """
+    amount_window = round(amount_tolerance * 100)
+    amount_width = amount_window + 1
+    date_width = date_tolerance + 1
+
+    def label_of(entry):
+        return entry['label'].lower() if match_labels else ''
+
+    def exact_key(entry):
+        return label_of(entry), round(entry['amount'] * 100), entry['date'].toordinal()
+
+    matched_pl = set()
+    matches = []
+
+    # Exact pass: hash join on the full key
+    exact_index = defaultdict(list)
+    for position, entry in enumerate(pl_entries):
+        exact_index[exact_key(entry)].append(position)
+    for position_list in exact_index.values():
+        position_list.reverse()  # pop() hands out entries in file order
+
+    remaining_expenses = []
+    for entry in expense_entries:
+        candidates = exact_index.get(exact_key(entry))
+        if candidates:
+            position = candidates.pop()
+            matched_pl.add(position)
+            matches.append((entry, pl_entries[position]))
+        else:
+            remaining_expenses.append(entry)
+
+    # Tolerance pass: bucket the profit/loss entries that are still unmatched
+    buckets = defaultdict(list)
+    if amount_window or date_tolerance:
+        for position, entry in enumerate(pl_entries):
+            if position in matched_pl:
+                continue
+            label, cents, ordinal = exact_key(entry)
+            buckets[(label, cents // amount_width, ordinal // date_width)].append(
+                (position, cents, ordinal))
+
+    unmatched_expenses = []
+    for entry in remaining_expenses:
+        label, cents, ordinal = exact_key(entry)
+        amount_bucket, date_bucket = cents // amount_width, ordinal // date_width
+
+        best = None
+        neighbours = [(label, amount_bucket + amount_step, date_bucket + date_step)
+                      for amount_step in (-1, 0, 1) for date_step in (-1, 0, 1)]
+        for key in neighbours:
+            for index, (_, pl_cents, pl_ordinal) in enumerate(buckets.get(key, ())):
+                amount_diff = abs(pl_cents - cents)
+                date_diff = abs(pl_ordinal - ordinal)
+                if amount_diff > amount_window or date_diff > date_tolerance:
+                    continue
+                if best is None or (amount_diff, date_diff) < best[:2]:
+                    best = (amount_diff, date_diff, key, index)
+
+        if best is None:
+            unmatched_expenses.append(entry)
+            continue
+
+        # Swap-remove the chosen candidate so it cannot be matched again
+        candidates = buckets[best[2]]
+        position = candidates[best[3]][0]
+        candidates[best[3]] = candidates[-1]
+        candidates.pop()
+        matched_pl.add(position)
+        matches.append((entry, pl_entries[position]))
+
+    matches.sort(key=lambda pair: pair[0]['row'])
+    unmatched_pl = [entry for position, entry in enumerate(pl_entries) if position not in matched_pl]
+
+    return {
+        'matches': matches,
+        'unmatched_expenses': unmatched_expenses,
+        'unmatched_pl': unmatched_pl,
+        'duplicate_expenses': find_duplicates(expense_entries),
+        'duplicate_pl': find_duplicates(pl_entries)
+    }
+
+
+def _describe(entry):
+    """One-line description of a ledger entry."""
+    return f"row {entry['row']}: {entry['date']} ${entry['amount']:.2f} {entry['label']}"
+
+
+def render_text(result):
+    """Render a reconciliation result as a text report."""
+    lines = ["=" * 50,
+             "          LEDGER RECONCILIATION RESULTS",
+             "=" * 50,
+             f"Matched: {len(result['matches'])}",
+             f"Unmatched Expense Entries: {len(result['unmatched_expenses'])}",
+             f"Unmatched P&L Entries: {len(result['unmatched_pl'])}",
+             f"Duplicate Groups (Expense/P&L): {len(result['duplicate_expenses'])}/{len(result['duplicate_pl'])}"]
+
+    lines.append("\nMATCHED:")
+    lines.extend(f"  {_describe(expense)}  <->  {_describe(pl)}" for expense, pl in result['matches'])
+    lines.append("\nUNMATCHED EXPENSE ENTRIES:")
+    lines.extend(f"  {_describe(entry)}" for entry in result['unmatched_expenses'])
+    lines.append("\nUNMATCHED P&L ENTRIES:")
+    lines.extend(f"  {_describe(entry)}" for entry in result['unmatched_pl'])
+    lines.append("\nDUPLICATE EXPENSE ENTRIES:")
+    lines.extend(f"  {', '.join(_describe(entry) for entry in group)}" for group in result['duplicate_expenses'])
+    lines.append("\nDUPLICATE P&L ENTRIES:")
+    lines.extend(f"  {', '.join(_describe(entry) for entry in group)}" for group in result['duplicate_pl'])
+    lines.append("\n" + "=" * 50)
+    return "\n".join(lines) + "\n"
+
+
+def render_csv(result):
+    """Render a reconciliation result as CSV, one line per entry."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(['Status', 'Ledger', 'Row', 'Date', 'Amount', 'Label', 'Matched Row'])
+
+    def entry_row(status, ledger, entry, matched_row=''):
+        return [status, ledger, entry['row'], entry['date'], f"{entry['amount']:.2f}",
+                entry['label'], matched_row]
+
+    for expense, pl in result['matches']:
+        writer.writerow(entry_row('matched', 'expense', expense, pl['row']))
+        writer.writerow(entry_row('matched', 'pl', pl, expense['row']))
+    writer.writerows(entry_row('unmatched', 'expense', entry) for entry in result['unmatched_expenses'])
+    writer.writerows(entry_row('unmatched', 'pl', entry) for entry in result['unmatched_pl'])
+    for ledger, key in (('expense', 'duplicate_expenses'), ('pl', 'duplicate_pl')):
+        for group in result[key]:
+            writer.writerows(entry_row('duplicate', ledger, entry) for entry in group)
+    return buffer.getvalue()
+
+
+def main():
+    """Main function."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(script_dir)
+
+    print("Ledger Reconciler")
+    print("Matches expense ledger entries against profit/loss expenses.\n")
+
+    default_expenses = os.path.join('..', 'Expense_Automation_Sprint', 'purchases.csv')
+    expense_file = input(f"Expense CSV file (default: {default_expenses}): ").strip() or default_expenses
+    pl_file = input("P&L CSV file (default: financial_data.csv): ").strip() or 'financial_data.csv'
+
+    try:
+        amount_tolerance = float(input("Amount tolerance in $ (default: 0.00): ").strip() or 0)
+        date_tolerance = int(input("Date tolerance in days (default: 0): ").strip() or 0)
+        if amount_tolerance < 0 or date_tolerance < 0:
+            raise ValueError
+    except ValueError:
+        print("Invalid tolerance. Using exact matching.")
+        amount_tolerance, date_tolerance = 0.0, 0
+    match_labels = input("Require category to match description? (y/n): ").strip().lower() != 'n'
+
+    try:
+        expense_entries = load_expense_ledger(expense_file)
+        pl_entries = load_pl_ledger(pl_file)
+    except FileNotFoundError as e:
+        print(f"Error: File '{e.filename}' not found.")
+        return
+
+    result = reconcile(expense_entries, pl_entries, amount_tolerance, date_tolerance, match_labels)
+    print(render_text(result), end='')
+
+    if input("Save reconciliation to file? (y/n): ").strip().lower() == 'y':
+        save_filename = input("Save filename (default: reconciliation.csv): ").strip() or 'reconciliation.csv'
+        renderer = render_csv if save_filename.lower().endswith('.csv') else render_text
+        try:
+            with open(save_filename, 'w') as f:
+                f.write(renderer(result))
+            print(f"Reconciliation saved to {save_filename}")
+        except Exception as e:
+            print(f"Error saving reconciliation: {e}")
+
+if __name__ == "__main__":
+    main()
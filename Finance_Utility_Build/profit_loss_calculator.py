@@ -11,6 +11,10 @@ Author: Xeyronox
 import csv
 import os
 from collections import defaultdict
+from datetime import datetime
+
+# Ingestion checks are shared with the Expense Automation Sprint project
+INGESTION_CHECKS_PATH = os.path.join('..', 'Expense_Automation_Sprint', 'ingestion_checks.py')
 
 def validate_row(row):
     """
@@ -51,8 +55,13 @@ def validate_row(row):
     except ValueError:
         return False, "Invalid amount format. Must be a number"
 
-def load_financial_data(csv_file):
-    """Load and validate financial data from CSV."""
+def load_financial_data(csv_file, checker=None):
+    """
+    Load and validate financial data from CSV.
+
+    When an IngestionChecker is given, rows identical to a recent row are
+    skipped; possible duplicates and outliers are reported as warnings.
+    """
     revenues = []
     expenses = []
     total_revenue = 0.0
@@ -68,6 +77,19 @@ def load_financial_data(csv_file):
                     continue
 
                 data = result
+                if checker:
+                    try:
+                        row_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
+                    except ValueError:
+                        row_date = None
+                    label = f"{data['type'].title()} - {data['description']}"
+                    is_duplicate, issues = checker.check(row.values(), row_date, label, data['amount'])
+                    if is_duplicate:
+                        print(f"Warning: Row {row_num} is a duplicate. Skipping.")
+                        continue
+                    for issue in issues:
+                        print(f"Warning: Row {row_num} flagged - {issue}.")
+
                 if data['type'] == 'revenue':
                     revenues.append(data)
                     total_revenue += data['amount']
@@ -87,49 +109,76 @@ def load_financial_data(csv_file):
         'net_profit': total_revenue - total_expenses
     }
 
-def display_results(data):
-    """Display the profit/loss results clearly."""
-    if data is None:
-        return
+def format_results(data):
+    """Build the profit/loss report as a single string."""
+    lines = []
 
-    print("\n" + "="*50)
-    print("          PROFIT/LOSS CALCULATOR RESULTS")
-    print("="*50)
+    lines.append("\n" + "="*50)
+    lines.append("          PROFIT/LOSS CALCULATOR RESULTS")
+    lines.append("="*50)
 
-    print("\nREVENUE SUMMARY:")
-    print(f"Total Revenue: ${data['total_revenue']:.2f}")
-    print(f"Number of Revenue Transactions: {len(data['revenues'])}")
+    lines.append("\nREVENUE SUMMARY:")
+    lines.append(f"Total Revenue: ${data['total_revenue']:.2f}")
+    lines.append(f"Number of Revenue Transactions: {len(data['revenues'])}")
     if data['revenues']:
-        print("Top Revenue Sources:")
+        lines.append("Top Revenue Sources:")
         sorted_rev = sorted(data['revenues'], key=lambda x: x['amount'], reverse=True)[:3]
         for rev in sorted_rev:
-            print(f"  ${rev['amount']:.2f} - {rev['description']} ({rev['date']})")
+            lines.append(f"  ${rev['amount']:.2f} - {rev['description']} ({rev['date']})")
 
-    print("\nEXPENSE SUMMARY:")
-    print(f"Total Expenses: ${data['total_expenses']:.2f}")
-    print(f"Number of Expense Transactions: {len(data['expenses'])}")
+    lines.append("\nEXPENSE SUMMARY:")
+    lines.append(f"Total Expenses: ${data['total_expenses']:.2f}")
+    lines.append(f"Number of Expense Transactions: {len(data['expenses'])}")
     if data['expenses']:
-        print("Top Expense Categories:")
+        lines.append("Top Expense Categories:")
         expense_by_desc = defaultdict(float)
         for exp in data['expenses']:
             expense_by_desc[exp['description']] += exp['amount']
         sorted_exp = sorted(expense_by_desc.items(), key=lambda x: x[1], reverse=True)[:3]
         for desc, amt in sorted_exp:
-            print(f"  ${amt:.2f} - {desc}")
+            lines.append(f"  ${amt:.2f} - {desc}")
 
-    print("\nNET RESULT:")
+    lines.append("\nNET RESULT:")
     net = data['net_profit']
     if net > 0:
-        print(f"[PROFIT] ${net:.2f}")
-        print("Great job! You're in the green.")
+        lines.append(f"[PROFIT] ${net:.2f}")
+        lines.append("Great job! You're in the green.")
     elif net < 0:
-        print(f"[LOSS] ${abs(net):.2f}")
-        print("Consider reviewing expenses or increasing revenue.")
+        lines.append(f"[LOSS] ${abs(net):.2f}")
+        lines.append("Consider reviewing expenses or increasing revenue.")
     else:
-        print("[BREAK-EVEN] $0.00")
-        print("Balanced budget achieved.")
+        lines.append("[BREAK-EVEN] $0.00")
+        lines.append("Balanced budget achieved.")
+
+    lines.append("\n" + "="*50)
+    return "\n".join(lines)
+
+def display_results(data):
+    """Display the profit/loss results clearly."""
+    if data is None:
+        return
+
+    # Build the whole report first so it reaches stdout in one write
+    print(format_results(data))
 
-    print("\n" + "="*50)
+def load_ingestion_checker():
+    """
+    Load IngestionChecker from the sibling Expense Automation Sprint project.
+
+    Only needed when the user asks for checks, so the calculator still runs
+    on its own. Returns None if the module cannot be found.
+    """
+    import importlib.util
+
+    module_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), INGESTION_CHECKS_PATH)
+    if not os.path.isfile(module_path):
+        print(f"Error: Duplicate and outlier checks need {INGESTION_CHECKS_PATH}, which was not found. "
+              "Continuing without checks.")
+        return None
+    spec = importlib.util.spec_from_file_location('ingestion_checks', module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.IngestionChecker
 
 def main():
     """Main function."""
@@ -141,7 +190,16 @@ def main():
 
     csv_file = input("Enter CSV file name (default: financial_data.csv): ").strip() or 'financial_data.csv'
 
-    data = load_financial_data(csv_file)
+    # Optional duplicate and outlier detection while loading
+    checker = None
+    if input("Check for duplicates and outliers? (y/n): ").strip().lower() == 'y':
+        checker_class = load_ingestion_checker()
+        if checker_class:
+            checker = checker_class()
+
+    data = load_financial_data(csv_file, checker)
+    if data and checker:
+        print(checker.summary())
     if data:
         display_results(data)
 